@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+导出性能测试
+用 100k 条模拟主题记录对比:
+- 旧方式: 改造前的 save_topics（标准库 json.dump，JSON / TXT / MD 依次逐行写入）
+- 新方式: 分别用标准库 json 和 orjson 运行新的导出引擎（按格式依次渲染，大块写入），
+  区分引擎本身和 JSON 编码器各自带来的变化
+
+用法: python bench_export.py [记录数]
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import main
+
+def legacy_save_topics(topics, filename_prefix, output_dir):
+    """旧版 save_topics（逐行写入文本文件，标准库 json.dump），作为对比基准"""
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    # JSON 格式
+    json_filename = f"{output_dir}/{filename_prefix}_{timestamp}.json"
+    with open(json_filename, 'w', encoding='utf-8') as f:
+        json.dump(topics, f, indent=2, ensure_ascii=False)
+    
+    # TXT 格式
+    txt_filename = f"{output_dir}/{filename_prefix}_{timestamp}.txt"
+    with open(txt_filename, 'w', encoding='utf-8') as f:
+        f.write(f"V2EX 备份\n")
+        f.write(f"备份时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"总计: {len(topics)} 个主题\n")
+        f.write("=" * 60 + "\n\n")
+        
+        for i, topic in enumerate(topics, 1):
+            f.write(f"{i}. {topic.get('title', 'N/A')}\n")
+            f.write(f"   节点: {topic.get('node', 'N/A')} | 作者: {topic.get('author', 'N/A')}\n")
+            f.write(f"   回复: {topic.get('replies', 0)} | 点赞: {topic.get('votes', 0)}\n")
+            f.write(f"   链接: {topic.get('url', 'N/A')}\n")
+            if topic.get('created_time'):
+                f.write(f"   发布: {topic['created_time']}\n")
+            f.write("\n")
+    
+    # Markdown 格式
+    md_filename = f"{output_dir}/{filename_prefix}_{timestamp}.md"
+    with open(md_filename, 'w', encoding='utf-8') as f:
+        f.write(f"# V2EX 备份\n\n")
+        f.write(f"**备份时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write(f"**总计**: {len(topics)} 个主题\n\n")
+        f.write("## 📚 所有主题\n\n")
+        
+        # 按节点分组
+        topics_by_node = {}
+        for topic in topics:
+            node = topic.get('node', '未分类')
+            if node not in topics_by_node:
+                topics_by_node[node] = []
+            topics_by_node[node].append(topic)
+        
+        for node, node_topics in sorted(topics_by_node.items()):
+            f.write(f"### {node} ({len(node_topics)})\n\n")
+            for topic in node_topics:
+                f.write(f"- **[{topic['title']}]({topic['url']})**\n")
+                f.write(f"  - 作者: [{topic.get('author', 'N/A')}]({topic.get('author_url', '#')})\n")
+                f.write(f"  - 回复: {topic.get('replies', 0)} | 点赞: {topic.get('votes', 0)}\n")
+                if topic.get('created_time'):
+                    f.write(f"  - 发布时间: {topic['created_time']}\n")
+                f.write("\n")
+    
+    return json_filename, txt_filename, md_filename
+
+def make_topics(count):
+    """生成模拟的主题记录"""
+    nodes = ['python', 'go', 'linux', 'apple', 'programmer', 'qna', 'jobs', 'share']
+    return [
+        {
+            'title': f"测试主题 {i} - 关于 V2EX 备份的讨论",
+            'url': f"{main.BASE_URL}/t/{1000000 + i}",
+            'id': str(1000000 + i),
+            'node': nodes[i % len(nodes)],
+            'node_url': f"{main.BASE_URL}/go/{nodes[i % len(nodes)]}",
+            'author': f"user{i % 5000}",
+            'author_url': f"{main.BASE_URL}/member/user{i % 5000}",
+            'replies': i % 300,
+            'votes': i % 17,
+            'created_time': "2024-05-01 12:34:56 +08:00",
+            'created_time_relative': "1 天前",
+            'last_reply_user': f"user{(i * 7) % 5000}",
+        }
+        for i in range(count)
+    ]
+
+def run_legacy(topics):
+    """用旧版 save_topics 导出一次并返回耗时（秒）"""
+    output_dir = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        legacy_save_topics(topics, 'bench', output_dir)
+        return time.perf_counter() - start
+    finally:
+        shutil.rmtree(output_dir)
+
+def run(topics, formats, use_orjson):
+    """导出一次并返回耗时（秒）"""
+    saved_orjson = main.orjson
+    if not use_orjson:
+        main.orjson = None
+    output_dir = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        main.export_records(topics, 'bench', formats=formats, output_dir=output_dir)
+        return time.perf_counter() - start
+    finally:
+        main.orjson = saved_orjson
+        shutil.rmtree(output_dir)
+
+def best_of(repeat, *args):
+    return min(run(*args) for _ in range(repeat))
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    topics = make_topics(count)
+
+    print(f"记录数: {count}  orjson: {'已安装' if main.orjson else '未安装'}")
+    print("=" * 60)
+
+    baseline = min(run_legacy(topics) for _ in range(3))
+    print(f"旧方式 (改造前的 save_topics):        {baseline:.3f}s")
+
+    stdlib = best_of(3, topics, ['json', 'txt', 'md'], False)
+    print(f"新引擎 + 标准库 json (json+txt+md):   {stdlib:.3f}s  ({baseline / stdlib:.2f}x)")
+
+    if main.orjson:
+        fast = best_of(3, topics, ['json', 'txt', 'md'], True)
+        print(f"新引擎 + orjson (json+txt+md):        {fast:.3f}s  ({baseline / fast:.2f}x)")
+
+        json_stdlib = best_of(3, topics, ['json'], False)
+        json_fast = best_of(3, topics, ['json'], True)
+        print(f"仅 JSON: 标准库 {json_stdlib:.3f}s -> orjson {json_fast:.3f}s  ({json_stdlib / json_fast:.2f}x)")
+
+    all_formats = best_of(3, topics, ['json', 'jsonl', 'txt', 'md', 'csv'], bool(main.orjson))
+    print(f"全部五种格式:                         {all_formats:.3f}s")
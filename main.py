@@ -9,21 +9,66 @@ V2EX 备份工具
 5. 从文件读取 Cookie (支持Chrome导出格式)
 6. 提取详细信息（点赞数、精确时间等）
 7. 去重功能
-8. 导出多种格式（JSON、TXT、Markdown）
+8. 导出多种格式（JSON、JSONL、TXT、Markdown、CSV，支持插件）
+9. 整节点归档 (/go/{node})，并发抓取、增量更新
+10. 按过期程度刷新已有备份的回复数、点赞数等字段
 """
 
 import requests
 from bs4 import BeautifulSoup
+import argparse
+import csv
+import importlib
+import io
 import json
+from json.encoder import encode_basestring
+import math
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+import threading
 import time
 import re
+import sys
+
+try:
+    import orjson  # 可选，更快的 JSON 编码器
+except ImportError:
+    orjson = None
 
 # 配置
 BASE_URL = "https://v2ex.com"
 COOKIE_FILE = "cookie.txt"
 BACKUP_DIR = "backups"
+NODE_CRAWL_WORKERS = 4        # 节点抓取的并发数
+NODE_REQUEST_INTERVAL = 0.5   # 所有 worker 共享的请求间隔（秒）
+NODE_SHIFT_RETRIES = 1        # 列表移动时重新抓取的最多轮数
+REFRESH_BUDGET = 100          # 刷新模式默认的请求预算
+REFRESH_REQUEST_INTERVAL = 1  # 刷新模式的请求间隔（秒）
+REPLIES_PER_PAGE = 100        # 主题页每页回复数
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_FORMATS = ['json', 'txt', 'md']
+WRITE_BUFFER_SIZE = 1 << 20   # 导出文件的写缓冲区大小
+
+# 已注册的导出格式: 名称 -> (扩展名, 渲染函数)
+EXPORT_FORMATS = {}
+
+class RateLimiter:
+    """线程安全的限速器，多个 worker 共享同一个请求速率"""
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+    
+    def wait(self):
+        """阻塞直到允许发出下一个请求"""
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
 
 def load_cookie(cookie_file=COOKIE_FILE):
     """从文件加载 Cookie，支持多种格式"""
@@ -113,8 +158,8 @@ def get_username_from_homepage(cookie):
         print(f"✗ 获取用户名时出错: {e}")
         return None
 
-def get_page(cookie, url):
-    """获取页面 HTML"""
+def fetch_page(cookie, url):
+    """获取页面，返回 (状态码, HTML)，请求出错时返回 (None, None)"""
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
         "Cookie": cookie,
@@ -123,14 +168,19 @@ def get_page(cookie, url):
     
     try:
         response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            return response.text
-        else:
-            print(f"✗ 获取页面失败, 状态码: {response.status_code}")
-            return None
+        return response.status_code, response.text
     except requests.exceptions.RequestException as e:
         print(f"✗ 请求出错: {e}")
-        return None
+        return None, None
+
+def get_page(cookie, url):
+    """获取页面 HTML"""
+    status_code, html = fetch_page(cookie, url)
+    if status_code == 200:
+        return html
+    if status_code is not None:
+        print(f"✗ 获取页面失败, 状态码: {status_code}")
+    return None
 
 def parse_topic_from_item(item):
     """从主题条目中解析信息"""
@@ -255,62 +305,217 @@ def remove_duplicates(topics):
     
     return unique_topics
 
-def save_topics(topics, filename_prefix, output_dir=BACKUP_DIR):
-    """保存主题到文件"""
-    os.makedirs(output_dir, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    # JSON 格式
-    json_filename = f"{output_dir}/{filename_prefix}_{timestamp}.json"
-    with open(json_filename, 'w', encoding='utf-8') as f:
-        json.dump(topics, f, indent=2, ensure_ascii=False)
-    
-    # TXT 格式
-    txt_filename = f"{output_dir}/{filename_prefix}_{timestamp}.txt"
-    with open(txt_filename, 'w', encoding='utf-8') as f:
-        f.write(f"V2EX 备份\n")
-        f.write(f"备份时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"总计: {len(topics)} 个主题\n")
-        f.write("=" * 60 + "\n\n")
-        
-        for i, topic in enumerate(topics, 1):
-            f.write(f"{i}. {topic.get('title', 'N/A')}\n")
-            f.write(f"   节点: {topic.get('node', 'N/A')} | 作者: {topic.get('author', 'N/A')}\n")
-            f.write(f"   回复: {topic.get('replies', 0)} | 点赞: {topic.get('votes', 0)}\n")
-            f.write(f"   链接: {topic.get('url', 'N/A')}\n")
+def register_format(name, extension=None):
+    """
+    注册导出格式（也用于用户插件）
+    渲染函数签名: render(records, meta) -> 可迭代的 str / bytes 片段
+    meta 包含 kind ('topics' 或 'replies')、title 和 time
+    """
+    def decorator(render):
+        EXPORT_FORMATS[name] = (extension or name, render)
+        return render
+    return decorator
+
+def _dumps_value(value, prefix):
+    """标准库编码单个字段值，嵌套结构按所在层级缩进"""
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if type(value) is int:
+        return int.__repr__(value)
+    return json.dumps(value, ensure_ascii=False, indent=2).replace('\n', '\n' + prefix)
+
+def _dumps_records_indented(records):
+    """
+    标准库下生成和 json.dumps(records, ensure_ascii=False, indent=2) 相同的文本
+    备份记录都是平铺的字典，直接拼接比标准库 indent 模式下的纯 Python 编码器快
+    """
+    if not isinstance(records, list) or not all(
+            type(r) is dict and all(type(k) is str for k in r) for r in records):
+        return json.dumps(records, ensure_ascii=False, indent=2)
+    if not records:
+        return '[]'
+    
+    items = []
+    for record in records:
+        if record:
+            fields = ',\n'.join(
+                f'    {encode_basestring(k)}: {_dumps_value(v, "    ")}' for k, v in record.items()
+            )
+            items.append('  {\n' + fields + '\n  }')
+        else:
+            items.append('  {}')
+    return '[\n' + ',\n'.join(items) + '\n]'
+
+def dumps_json(obj, indent=False):
+    """序列化为 UTF-8 JSON，安装了 orjson 时使用 orjson，两种方式输出相同"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return _dumps_records_indented(obj).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+@register_format('json')
+def render_json(records, meta):
+    yield dumps_json(records, indent=True)
+
+@register_format('jsonl')
+def render_jsonl(records, meta):
+    for i in range(0, len(records), 1000):
+        yield b"".join(dumps_json(record) + b"\n" for record in records[i:i + 1000])
+
+@register_format('csv')
+def render_csv(records, meta):
+    # 列为所有记录字段的并集，按首次出现的顺序
+    fieldnames = list(dict.fromkeys(key for record in records for key in record))
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    for i in range(0, len(records), 1000):
+        writer.writerows(records[i:i + 1000])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+@register_format('txt')
+def render_txt(records, meta):
+    if meta['kind'] == 'replies':
+        yield f"{meta['title']}\n"
+        yield f"备份时间: {meta['time']}\n"
+        yield f"总回复数: {len(records)}\n"
+        yield "=" * 80 + "\n\n"
+        
+        for i, reply in enumerate(records, 1):
+            yield (
+                f"{i}. {reply.get('time', 'N/A')}\n"
+                f"   主题: {reply.get('topic_title', 'N/A')}\n"
+                f"   作者: {reply.get('topic_author', 'N/A')}\n"
+                f"   节点: {reply.get('node', 'N/A')}\n"
+                f"   链接: {reply.get('topic_url', 'N/A')}\n"
+                f"   回复内容:\n"
+                f"   {reply.get('content', 'N/A')}\n"
+                "\n" + "-" * 80 + "\n\n"
+            )
+        return
+    
+    yield f"{meta['title']}\n"
+    yield f"备份时间: {meta['time'].strftime('%Y-%m-%d %H:%M:%S')}\n"
+    yield f"总计: {len(records)} 个主题\n"
+    yield "=" * 60 + "\n\n"
+    
+    for i, topic in enumerate(records, 1):
+        chunk = (
+            f"{i}. {topic.get('title', 'N/A')}\n"
+            f"   节点: {topic.get('node', 'N/A')} | 作者: {topic.get('author', 'N/A')}\n"
+            f"   回复: {topic.get('replies', 0)} | 点赞: {topic.get('votes', 0)}\n"
+            f"   链接: {topic.get('url', 'N/A')}\n"
+        )
+        if topic.get('created_time'):
+            chunk += f"   发布: {topic['created_time']}\n"
+        yield chunk + "\n"
+
+@register_format('md')
+def render_md(records, meta):
+    if meta['kind'] == 'replies':
+        yield f"# {meta['title']}\n\n"
+        yield f"**备份时间**: {meta['time']}\n\n"
+        yield f"**总回复数**: {len(records)}\n\n"
+        yield "---\n\n"
+        
+        for i, reply in enumerate(records, 1):
+            yield (
+                f"## {i}. {reply.get('topic_title', 'N/A')}\n\n"
+                f"- **时间**: {reply.get('time', 'N/A')}\n"
+                f"- **主题作者**: {reply.get('topic_author', 'N/A')}\n"
+                f"- **节点**: {reply.get('node', 'N/A')}\n"
+                f"- **链接**: [{reply.get('topic_url', 'N/A')}]({reply.get('topic_url', 'N/A')})\n\n"
+                f"**回复内容**:\n\n"
+                f"{reply.get('content', 'N/A')}\n\n"
+                "---\n\n"
+            )
+        return
+    
+    yield f"# {meta['title']}\n\n"
+    yield f"**备份时间**: {meta['time'].strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    yield f"**总计**: {len(records)} 个主题\n\n"
+    yield "## 📚 所有主题\n\n"
+    
+    # 按节点分组
+    topics_by_node = {}
+    for topic in records:
+        topics_by_node.setdefault(topic.get('node', '未分类'), []).append(topic)
+    
+    for node, node_topics in sorted(topics_by_node.items()):
+        yield f"### {node} ({len(node_topics)})\n\n"
+        for topic in node_topics:
+            chunk = (
+                f"- **[{topic['title']}]({topic['url']})**\n"
+                f"  - 作者: [{topic.get('author', 'N/A')}]({topic.get('author_url', '#')})\n"
+                f"  - 回复: {topic.get('replies', 0)} | 点赞: {topic.get('votes', 0)}\n"
+            )
             if topic.get('created_time'):
-                f.write(f"   发布: {topic['created_time']}\n")
-            f.write("\n")
-    
-    # Markdown 格式
-    md_filename = f"{output_dir}/{filename_prefix}_{timestamp}.md"
-    with open(md_filename, 'w', encoding='utf-8') as f:
-        f.write(f"# V2EX 备份\n\n")
-        f.write(f"**备份时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(f"**总计**: {len(topics)} 个主题\n\n")
-        f.write("## 📚 所有主题\n\n")
-        
-        # 按节点分组
-        topics_by_node = {}
-        for topic in topics:
-            node = topic.get('node', '未分类')
-            if node not in topics_by_node:
-                topics_by_node[node] = []
-            topics_by_node[node].append(topic)
-        
-        for node, node_topics in sorted(topics_by_node.items()):
-            f.write(f"### {node} ({len(node_topics)})\n\n")
-            for topic in node_topics:
-                f.write(f"- **[{topic['title']}]({topic['url']})**\n")
-                f.write(f"  - 作者: [{topic.get('author', 'N/A')}]({topic.get('author_url', '#')})\n")
-                f.write(f"  - 回复: {topic.get('replies', 0)} | 点赞: {topic.get('votes', 0)}\n")
-                if topic.get('created_time'):
-                    f.write(f"  - 发布时间: {topic['created_time']}\n")
-                f.write("\n")
-    
-    return json_filename, txt_filename, md_filename
-
-def backup_favorites(cookie, output_dir=BACKUP_DIR):
+                chunk += f"  - 发布时间: {topic['created_time']}\n"
+            yield chunk + "\n"
+
+def write_format(render, records, meta, filename):
+    """把渲染结果合并成大块后写入文件（文本片段攒够一批再统一编码）"""
+    with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        pending = []
+        for chunk in render(records, meta):
+            if isinstance(chunk, bytes):
+                if pending:
+                    f.write(''.join(pending).encode('utf-8'))
+                    pending.clear()
+                f.write(chunk)
+            else:
+                pending.append(chunk)
+                if len(pending) >= 1000:
+                    f.write(''.join(pending).encode('utf-8'))
+                    pending.clear()
+        if pending:
+            f.write(''.join(pending).encode('utf-8'))
+    return filename
+
+def export_records(records, filename_prefix, kind='topics', title="V2EX 备份",
+                   formats=None, output_dir=BACKUP_DIR):
+    """
+    按选定的格式导出记录
+    返回 {格式: 文件路径}
+    """
+    formats = formats or DEFAULT_FORMATS
+    unknown = [name for name in formats if name not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"未知的导出格式: {', '.join(unknown)}")
+    
+    os.makedirs(output_dir, exist_ok=True)
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    meta = {'kind': kind, 'title': title, 'time': now}
+    
+    files = {}
+    for name in formats:
+        extension, render = EXPORT_FORMATS[name]
+        filename = os.path.join(output_dir, f"{filename_prefix}_{timestamp}.{extension}")
+        files[name] = write_format(render, records, meta, filename)
+    
+    return files
+
+def print_saved_files(files):
+    """打印导出的文件列表"""
+    print(f"\n文件已保存:")
+    for name, filename in files.items():
+        print(f"  📄 {name.upper() + ':':<5} {filename}")
+
+def save_topics(topics, filename_prefix, output_dir=BACKUP_DIR, formats=None):
+    """保存主题到文件"""
+    return export_records(topics, filename_prefix, 'topics', formats=formats, output_dir=output_dir)
+
+def backup_favorites(cookie, output_dir=BACKUP_DIR, formats=None):
     """备份我的收藏"""
     print("\n" + "=" * 60)
     print("开始备份: 我的收藏")
@@ -365,22 +570,19 @@ def backup_favorites(cookie, output_dir=BACKUP_DIR):
             print(f"\n✓ 去重: 移除了 {original_count - len(all_topics)} 个重复项")
         
         # 保存
-        json_file, txt_file, md_file = save_topics(all_topics, 'favorites', output_dir)
+        files = save_topics(all_topics, 'favorites', output_dir, formats)
         
         print("\n" + "=" * 60)
         print("✓ 收藏备份完成!")
         print(f"  总共收藏: {len(all_topics)} 个主题")
-        print(f"\n文件已保存:")
-        print(f"  📄 JSON: {json_file}")
-        print(f"  📄 TXT:  {txt_file}")
-        print(f"  📄 MD:   {md_file}")
+        print_saved_files(files)
         print("=" * 60)
         
         return all_topics
     
     return None
 
-def backup_user_topics(cookie, username, output_dir=BACKUP_DIR):
+def backup_user_topics(cookie, username, output_dir=BACKUP_DIR, formats=None):
     """备份我的发帖"""
     print("\n" + "=" * 60)
     print(f"开始备份: 我的发帖 (用户: {username})")
@@ -430,21 +632,484 @@ def backup_user_topics(cookie, username, output_dir=BACKUP_DIR):
             print(f"\n✓ 去重: 移除了 {original_count - len(all_topics)} 个重复项")
         
         # 保存
-        json_file, txt_file, md_file = save_topics(all_topics, f'my_topics_{username}', output_dir)
+        files = save_topics(all_topics, f'my_topics_{username}', output_dir, formats)
         
         print("\n" + "=" * 60)
         print("✓ 发帖备份完成!")
         print(f"  总共发帖: {len(all_topics)} 个主题")
-        print(f"\n文件已保存:")
-        print(f"  📄 JSON: {json_file}")
-        print(f"  📄 TXT:  {txt_file}")
-        print(f"  📄 MD:   {md_file}")
+        print_saved_files(files)
         print("=" * 60)
         
         return all_topics
     
     return None
 
+def parse_max_page(html):
+    """从分页控件中解析总页数（节点可能有上千页，不做上限截断）"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 优先使用页码输入框的 max 属性
+    page_input = soup.find('input', class_='page_input')
+    if page_input and page_input.get('max', '').isdigit():
+        return int(page_input['max'])
+    
+    page_numbers = set()
+    for link in soup.find_all('a'):
+        href = link.get('href', '')
+        if '?p=' in href:
+            try:
+                page_numbers.add(int(href.split('p=')[1].split('&')[0].split('#')[0]))
+            except:
+                pass
+    
+    return max(page_numbers) if page_numbers else 1
+
+def parse_node_page(html, node):
+    """解析节点列表页 /go/{node}，返回主题列表"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # 节点页的主题条目位于 #TopicsNode 下，兼容 cell item 结构
+    container = soup.find('div', id='TopicsNode')
+    if container:
+        items = container.find_all('div', class_='cell', recursive=False)
+    else:
+        items = soup.find_all('div', class_='cell item')
+    
+    topics = []
+    for item in items:
+        topic = parse_topic_from_item(item)
+        if topic and topic.get('id'):
+            # 节点页的条目中没有节点链接，补上当前节点
+            topic.setdefault('node', node)
+            topic.setdefault('node_url', f"{BASE_URL}/go/{node}")
+            topics.append(topic)
+    
+    return topics
+
+def load_seen_ids(jsonl_file):
+    """
+    读取已归档的 JSONL 文件，返回 {topic ID: 回复数}
+    同一主题可能有多行（回复数变化时追加），以最后一行为准
+    """
+    seen = {}
+    if not os.path.exists(jsonl_file):
+        return seen
+    
+    with open(jsonl_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                topic = json.loads(line)
+            except ValueError:
+                # 上次中断时可能留下不完整的最后一行
+                continue
+            if topic.get('id'):
+                seen[topic['id']] = topic.get('replies')
+    
+    return seen
+
+def shifted_below_head(old_ids, new_ids):
+    """第 1 页从 old_ids 变为 new_ids 时，是否有主题从更深的页或新发布进入第 1 页（后面的页因此后移）"""
+    return any(topic_id not in old_ids for topic_id in new_ids)
+
+def load_crawl_state(state_file):
+    """读取节点抓取进度: complete 表示是否完整抓取过一遍，next_page 表示中断后从哪一页继续"""
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    return {'complete': bool(state.get('complete')), 'next_page': state.get('next_page')}
+
+def save_crawl_state(state_file, complete, next_page):
+    """保存节点抓取进度（先写临时文件再替换）"""
+    tmp_file = state_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'complete': complete, 'next_page': next_page}, f)
+    os.replace(tmp_file, state_file)
+
+def crawl_node(cookie, node, output_dir=BACKUP_DIR, workers=NODE_CRAWL_WORKERS,
+               incremental=True, limiter=None):
+    """
+    归档整个节点 /go/{node}
+    - 页码按批次分给多个 worker 并发抓取，共享同一个限速器
+    - 每页结果立即追加写入 node_{node}.jsonl，进度写入 node_{node}.state.json
+    - 中断后从上次的进度继续；完整抓取过一遍之后，增量模式遇到整页都是回复数
+      没有变化的已归档主题时停止
+    - 每批结束后复查第 1 页，有主题从后面进入第 1 页说明列表在本批抓取期间后移过，
+      重抓无法确认衔接的页，避免页边界上的主题被漏掉
+    """
+    print("\n" + "=" * 60)
+    print(f"开始归档节点: {node}")
+    print("=" * 60)
+    
+    limiter = limiter or RateLimiter(NODE_REQUEST_INTERVAL)
+    os.makedirs(output_dir, exist_ok=True)
+    jsonl_file = os.path.join(output_dir, f'node_{node}.jsonl')
+    state_file = os.path.join(output_dir, f'node_{node}.state.json')
+    
+    # 本次运行开始前的归档，用于判断是否到达上次的位置
+    known_replies = load_seen_ids(jsonl_file)
+    archived = dict(known_replies)
+    if known_replies:
+        print(f"✓ 已有归档: {len(known_replies)} 个主题")
+    
+    state = load_crawl_state(state_file)
+    complete = state['complete']
+    # 只有完整抓取过一遍，才能在遇到已归档主题时停止
+    can_stop = incremental and complete and bool(known_replies)
+    start_page = max(state['next_page'] or 2, 2) if incremental else 2
+    if start_page > 2:
+        print(f"✓ 上次抓取中断，从第 {start_page} 页继续")
+    
+    def fetch(page):
+        limiter.wait()
+        url = f"{BASE_URL}/go/{node}?p={page}"
+        html = get_page(cookie, url)
+        if not html:
+            return page, None, 1
+        return page, parse_node_page(html, node), parse_max_page(html)
+    
+    def unchanged(topics):
+        # 列表按最后活动时间排序，有新回复的旧主题会回到前面，不能作为停止的依据
+        return bool(topics) and all(
+            t['id'] in known_replies and known_replies[t['id']] == t.get('replies')
+            for t in topics
+        )
+    
+    new_count = 0
+    
+    with open(jsonl_file, 'ab') as out:
+        def write_new(topics):
+            # 只在主线程中写文件，无需加锁；已归档主题的回复数变化时追加一行新记录
+            added = 0
+            for topic in topics:
+                if topic['id'] not in archived:
+                    added += 1
+                elif archived[topic['id']] == topic.get('replies'):
+                    continue
+                archived[topic['id']] = topic.get('replies')
+                out.write(dumps_json(topic) + b"\n")
+            out.flush()
+            return added
+        
+        # 第 1 页：同时获取总页数
+        _, topics, total_pages = fetch(1)
+        if topics is None:
+            print(f"✗ 无法获取节点 {node}")
+            return None
+        if not topics:
+            print(f"节点 {node} 没有找到内容")
+            return 0
+        
+        # 从中断处继续时，第 1 页之后还有未抓取的页，不能据此停止
+        reached_known = can_stop and start_page == 2 and unchanged(topics)
+        added = write_new(topics)
+        new_count += added
+        head_ids = [t['id'] for t in topics]
+        print(f"✓ 共 {total_pages} 页，第 1 页新增 {added} 个主题")
+        
+        failed_pages = set()
+        page = start_page
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            def fetch_batch(pages):
+                futures = [executor.submit(fetch, p) for p in pages]
+                return [future.result() for future in as_completed(futures)]
+            
+            while page <= total_pages and not reached_known:
+                # 每批 workers * 2 页，批次之间检查是否可以提前停止
+                batch = list(range(page, min(page + workers * 2, total_pages + 1)))
+                pages = {}
+                results = fetch_batch(batch)
+                
+                for attempt in range(NODE_SHIFT_RETRIES + 1):
+                    for p, topics, max_page in sorted(results, key=lambda r: r[0]):
+                        if topics is None:
+                            continue
+                        # 抓取期间节点可能变长
+                        total_pages = max(total_pages, max_page)
+                        pages[p] = topics
+                        if can_stop and unchanged(topics):
+                            reached_known = True
+                        added = write_new(topics)
+                        new_count += added
+                        print(f"✓ 第 {p}/{total_pages} 页: 新增 {added} 个主题 (累计新增: {new_count})")
+                    
+                    # 新主题和从深处被顶上来的主题都会进入第 1 页，并把后面的页整体后移。
+                    # 后移时，如果某页在移动后抓取、它的下一页在移动前抓取，原本在页尾的
+                    # 主题会被漏掉；只需重抓和上一页没有重叠（无法确认衔接）的页
+                    _, head, max_page = fetch(1)
+                    if head is None:
+                        break
+                    total_pages = max(total_pages, max_page)
+                    new_head_ids = [t['id'] for t in head]
+                    shifted = shifted_below_head(head_ids, new_head_ids)
+                    head_ids = new_head_ids
+                    new_count += write_new(head)
+                    if not shifted:
+                        break
+                    
+                    suspects = [
+                        p for p in batch[1:] if p in pages
+                        and not (p - 1 in pages and pages[p - 1][-1]['id'] in {t['id'] for t in pages[p]})
+                    ]
+                    if not suspects:
+                        break
+                    if attempt == NODE_SHIFT_RETRIES:
+                        print(f"⚠ 列表持续移动，第 {suspects[0]}-{suspects[-1]} 页边界上的主题可能被漏掉，"
+                              f"下次运行时会补上")
+                        break
+                    print(f"列表在抓取期间发生移动，重新抓取 {len(suspects)} 页")
+                    results = fetch_batch(suspects)
+                
+                failed_pages |= set(batch) - set(pages)
+                page = batch[-1] + 1
+                save_crawl_state(state_file, complete, min(failed_pages | {page}))
+        
+        if reached_known:
+            print("\n✓ 已到达上次归档的位置，停止抓取")
+        
+        # 重试失败的页面
+        for p in sorted(failed_pages):
+            _, topics, _ = fetch(p)
+            if topics is not None:
+                failed_pages.discard(p)
+                added = write_new(topics)
+                new_count += added
+                print(f"✓ 重试第 {p} 页: 新增 {added} 个主题")
+            else:
+                print(f"✗ 第 {p} 页重试失败")
+        
+        # 抓取期间有回复的主题会被顶到前面，重新扫描前几页直到没有新主题
+        p = 1
+        while p <= total_pages:
+            _, topics, _ = fetch(p)
+            if not topics:
+                break
+            added = write_new(topics)
+            if not added:
+                break
+            new_count += added
+            print(f"✓ 复查第 {p} 页: 新增 {added} 个主题")
+            p += 1
+    
+    if failed_pages:
+        # 下次从第一个失败的页面继续
+        save_crawl_state(state_file, complete, min(failed_pages))
+        print(f"\n✗ {len(failed_pages)} 页抓取失败，下次运行时从第 {min(failed_pages)} 页继续")
+    else:
+        save_crawl_state(state_file, True, None)
+    
+    print("\n" + "=" * 60)
+    print(f"✓ 节点 {node} 归档完成!")
+    print(f"  本次新增: {new_count} 个主题 (总计: {len(archived)})")
+    print(f"\n文件已保存:")
+    print(f"  📄 JSONL: {jsonl_file}")
+    print("=" * 60)
+    
+    return new_count
+
+def parse_time(value):
+    """解析 'YYYY-MM-DD HH:MM:SS' 开头的时间字符串，失败返回 None"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:19], TIME_FORMAT)
+    except ValueError:
+        return None
+
+def load_archive(archive_file):
+    """读取已有备份，支持 JSON 列表和 JSONL 两种格式"""
+    with open(archive_file, 'r', encoding='utf-8') as f:
+        if not archive_file.endswith('.jsonl'):
+            return json.load(f)
+        
+        # 节点归档中同一主题可能有多行，以最后一行为准
+        topics = {}
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                topic = json.loads(line)
+            except ValueError:
+                # 抓取中断时可能留下不完整的最后一行
+                continue
+            topics[topic.get('id') or len(topics)] = topic
+        return list(topics.values())
+
+def write_archive(topics, archive_file):
+    """原地写回备份文件（先写临时文件再替换，避免中断时损坏）"""
+    tmp_file = archive_file + '.tmp'
+    with open(tmp_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        if archive_file.endswith('.jsonl'):
+            for topic in topics:
+                f.write(dumps_json(topic) + b"\n")
+        else:
+            f.write(dumps_json(topics, indent=True))
+    os.replace(tmp_file, archive_file)
+
+def staleness_score(topic, now, default_checked):
+    """
+    估算主题自上次检查以来发生变化的可能性
+    - 回复速率: 回复数 / 主题存在天数
+    - 距上次检查的天数: 速率 * 天数 ≈ 错过的回复数
+    - 最近活跃度: 最近有变化的主题更可能继续变化
+    - 连续无法访问（已删除、受限节点等）的主题降低优先级
+    """
+    created = parse_time(topic.get('created_time')) or default_checked
+    checked = parse_time(topic.get('checked_at')) or default_checked
+    last_active = parse_time(topic.get('changed_at')) or created
+    
+    age_days = max((now - created).total_seconds() / 86400, 0)
+    since_check_days = max((now - checked).total_seconds() / 86400, 0)
+    idle_days = max((now - last_active).total_seconds() / 86400, 0)
+    
+    reply_rate = (topic.get('replies', 0) + 1) / (age_days + 1)
+    recency = 1 + 7 / (7 + idle_days)
+    
+    return reply_rate * since_check_days * recency / (1 + topic.get('unavailable', 0)) ** 2
+
+def parse_topic_page(html):
+    """
+    解析主题页 /t/{id}，返回回复数、点赞数和当前页最后一个回复者
+    找不到的字段为 None；不是主题页（登录页、受限节点等）时返回 None
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    main_box = soup.find('div', id='Main')
+    header = main_box.find('div', class_='header') if main_box else None
+    if not header or not header.find('h1'):
+        return None
+    
+    info = {'replies': None, 'votes': None, 'last_reply_user': None}
+    
+    for gray in main_box.find_all('span', class_='gray'):
+        replies_match = re.search(r'(\d+)\s*条回复', gray.get_text())
+        if replies_match:
+            info['replies'] = int(replies_match.group(1))
+            break
+    
+    votes_element = header.find('div', class_='votes')
+    if votes_element:
+        votes_match = re.search(r'(\d+)', votes_element.get_text(strip=True))
+        if votes_match:
+            info['votes'] = int(votes_match.group(1))
+    
+    reply_cells = main_box.find_all('div', id=re.compile(r'^r_\d+'))
+    if reply_cells:
+        author_link = reply_cells[-1].find('strong')
+        if author_link:
+            info['last_reply_user'] = author_link.get_text(strip=True)
+    
+    return info
+
+def archive_time(archive_file):
+    """备份的生成时间：优先取文件名中的 _YYYYmmdd_HHMMSS 时间戳，否则取文件修改时间"""
+    match = re.search(r'_(\d{8}_\d{6})', os.path.basename(archive_file))
+    if match:
+        return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+    return datetime.fromtimestamp(os.path.getmtime(archive_file))
+
+def refresh_archive(cookie, archive_file, budget=REFRESH_BUDGET, limiter=None):
+    """
+    按过期程度刷新已有备份中的 replies、votes、last_reply_user 字段
+    只在固定的请求预算内抓取最可能已变化的主题，结果原地写回
+    """
+    print("\n" + "=" * 60)
+    print(f"开始刷新: {archive_file} (请求预算: {budget})")
+    print("=" * 60)
+    
+    try:
+        topics = load_archive(archive_file)
+    except (OSError, ValueError) as e:
+        print(f"✗ 读取备份文件时出错: {e}")
+        return None
+    
+    limiter = limiter or RateLimiter(REFRESH_REQUEST_INTERVAL)
+    now = datetime.now()
+    # 没有检查记录的主题，以备份的生成时间作为上次检查时间，并写回文件，
+    # 之后改写文件（修改时间变化）也不会影响这些主题的排序
+    default_checked = archive_time(archive_file)
+    for topic in topics:
+        topic.setdefault('checked_at', default_checked.strftime(TIME_FORMAT))
+    
+    candidates = [t for t in topics if t.get('id')]
+    candidates.sort(key=lambda t: staleness_score(t, now, default_checked), reverse=True)
+    
+    requests_used = 0
+    checked_count = 0
+    changed_count = 0
+    
+    try:
+        for topic in candidates:
+            if requests_used >= budget:
+                break
+            
+            limiter.wait()
+            requests_used += 1
+            status_code, html = fetch_page(cookie, f"{BASE_URL}/t/{topic['id']}")
+            checked_at = datetime.now().strftime(TIME_FORMAT)
+            if status_code not in (200, 404):
+                # 临时的网络错误，不记录检查时间
+                if status_code is not None:
+                    print(f"✗ 获取页面失败, 状态码: {status_code}")
+                continue
+            
+            if status_code == 200 and '登录' in html and 'Google 账号登录' in html:
+                print("\n✗ Cookie 可能已失效!")
+                break
+            
+            info = parse_topic_page(html) if status_code == 200 else None
+            if info is None:
+                # 主题已被删除或无法查看（受限节点、删除后跳转等）：只记录这次检查，
+                # 不改动字段，并降低它之后的优先级，避免每次都占用预算
+                topic['checked_at'] = checked_at
+                topic['unavailable'] = topic.get('unavailable', 0) + 1
+                print(f"✗ 主题无法访问: {topic.get('title', topic['id'])[:40]}")
+                continue
+            topic.pop('unavailable', None)
+            
+            # 回复超过一页时，最后回复者在最后一页
+            last_page = math.ceil((info['replies'] or 0) / REPLIES_PER_PAGE)
+            if last_page > 1:
+                info['last_reply_user'] = None
+                if requests_used < budget:
+                    limiter.wait()
+                    requests_used += 1
+                    last_html = get_page(cookie, f"{BASE_URL}/t/{topic['id']}?p={last_page}")
+                    last_info = parse_topic_page(last_html) if last_html else None
+                    if last_info:
+                        info['last_reply_user'] = last_info['last_reply_user']
+            
+            # 只更新实际解析到的字段
+            info = {k: v for k, v in info.items() if v is not None}
+            changes = {k: v for k, v in info.items() if topic.get(k) != v}
+            topic.update(info)
+            topic['checked_at'] = checked_at
+            checked_count += 1
+            
+            if changes:
+                topic['changed_at'] = checked_at
+                changed_count += 1
+                summary = ', '.join(f"{k}: {v}" for k, v in changes.items())
+                print(f"✓ {topic.get('title', topic['id'])[:40]} ({summary})")
+    finally:
+        # 中断时也保存已刷新的结果
+        write_archive(topics, archive_file)
+    
+    print("\n" + "=" * 60)
+    print("✓ 刷新完成!")
+    print(f"  使用请求: {requests_used}/{budget}")
+    print(f"  检查主题: {checked_count} 个，其中 {changed_count} 个有变化")
+    print(f"\n文件已更新:")
+    print(f"  📄 {archive_file}")
+    print("=" * 60)
+    
+    return changed_count
+
 def parse_reply_item(dock_area, inner):
     """解析单个回复条目"""
     try:
@@ -492,7 +1157,7 @@ def parse_reply_item(dock_area, inner):
         print(f"✗ 解析回复时出错: {e}")
         return None
 
-def backup_user_replies(cookie, username, output_dir=BACKUP_DIR):
+def backup_user_replies(cookie, username, output_dir=BACKUP_DIR, formats=None):
     """备份我的回复"""
     print("\n" + "=" * 60)
     print(f"开始备份: 我的回复 (用户: {username})")
@@ -575,57 +1240,14 @@ def backup_user_replies(cookie, username, output_dir=BACKUP_DIR):
     
     if all_replies:
         # 保存回复
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # JSON 格式
-        json_file = os.path.join(output_dir, f'my_replies_{username}_{timestamp}.json')
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(all_replies, f, ensure_ascii=False, indent=2)
-        
-        # TXT 格式
-        txt_file = os.path.join(output_dir, f'my_replies_{username}_{timestamp}.txt')
-        with open(txt_file, 'w', encoding='utf-8') as f:
-            f.write(f"V2EX 回复备份 - {username}\n")
-            f.write(f"备份时间: {datetime.now()}\n")
-            f.write(f"总回复数: {len(all_replies)}\n")
-            f.write("=" * 80 + "\n\n")
-            
-            for i, reply in enumerate(all_replies, 1):
-                f.write(f"{i}. {reply.get('time', 'N/A')}\n")
-                f.write(f"   主题: {reply.get('topic_title', 'N/A')}\n")
-                f.write(f"   作者: {reply.get('topic_author', 'N/A')}\n")
-                f.write(f"   节点: {reply.get('node', 'N/A')}\n")
-                f.write(f"   链接: {reply.get('topic_url', 'N/A')}\n")
-                f.write(f"   回复内容:\n")
-                f.write(f"   {reply.get('content', 'N/A')}\n")
-                f.write("\n" + "-" * 80 + "\n\n")
-        
-        # Markdown 格式
-        md_file = os.path.join(output_dir, f'my_replies_{username}_{timestamp}.md')
-        with open(md_file, 'w', encoding='utf-8') as f:
-            f.write(f"# V2EX 回复备份 - {username}\n\n")
-            f.write(f"**备份时间**: {datetime.now()}\n\n")
-            f.write(f"**总回复数**: {len(all_replies)}\n\n")
-            f.write("---\n\n")
-            
-            for i, reply in enumerate(all_replies, 1):
-                f.write(f"## {i}. {reply.get('topic_title', 'N/A')}\n\n")
-                f.write(f"- **时间**: {reply.get('time', 'N/A')}\n")
-                f.write(f"- **主题作者**: {reply.get('topic_author', 'N/A')}\n")
-                f.write(f"- **节点**: {reply.get('node', 'N/A')}\n")
-                f.write(f"- **链接**: [{reply.get('topic_url', 'N/A')}]({reply.get('topic_url', 'N/A')})\n\n")
-                f.write(f"**回复内容**:\n\n")
-                f.write(f"{reply.get('content', 'N/A')}\n\n")
-                f.write("---\n\n")
+        files = export_records(all_replies, f'my_replies_{username}', 'replies',
+                               title=f"V2EX 回复备份 - {username}",
+                               formats=formats, output_dir=output_dir)
         
         print("\n" + "=" * 60)
         print("✓ 回复备份完成!")
         print(f"  总回复数: {len(all_replies)} 条")
-        print(f"\n文件已保存:")
-        print(f"  📄 JSON: {json_file}")
-        print(f"  📄 TXT:  {txt_file}")
-        print(f"  📄 MD:   {md_file}")
+        print_saved_files(files)
         print("=" * 60)
         
         return all_replies
@@ -659,7 +1281,45 @@ def test_cookie(cookie):
         print(f"✗ 测试出错: {e}")
         return False
 
+def positive_int(value):
+    """argparse 类型: 正整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"不是整数: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须大于 0: {value}")
+    return number
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="V2EX 备份工具")
+    parser.add_argument('--node', action='append', metavar='NODE',
+                        help="归档整个节点 /go/NODE，可重复指定")
+    parser.add_argument('--workers', type=positive_int, default=NODE_CRAWL_WORKERS,
+                        help=f"节点抓取的并发数 (默认: {NODE_CRAWL_WORKERS})")
+    parser.add_argument('--full', action='store_true',
+                        help="节点抓取时不在已归档位置停止，完整扫描所有页")
+    parser.add_argument('--refresh', action='append', metavar='ARCHIVE',
+                        help="刷新已有主题备份 (.json / .jsonl) 中的回复数、点赞数等字段，可重复指定")
+    parser.add_argument('--budget', type=positive_int, default=REFRESH_BUDGET,
+                        help=f"刷新模式下每个备份文件的请求预算 (默认: {REFRESH_BUDGET})")
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS),
+                        help="导出格式，逗号分隔 (内置: json,jsonl,txt,md,csv；默认: %(default)s)")
+    parser.add_argument('--plugin', action='append', default=[], metavar='MODULE',
+                        help="加载导出插件模块（模块中用 register_format 注册格式），可重复指定")
+    args = parser.parse_args()
+    
+    # 加载导出插件；插件通过 `from main import register_format` 注册格式，
+    # 需要让它拿到当前运行的模块，而不是重新导入一份
+    sys.modules.setdefault('main', sys.modules[__name__])
+    for module_name in args.plugin:
+        importlib.import_module(module_name)
+    
+    formats = [name.strip() for name in args.formats.split(',') if name.strip()]
+    unknown = [name for name in formats if name not in EXPORT_FORMATS]
+    if unknown:
+        parser.error(f"未知的导出格式: {', '.join(unknown)}")
+    
     print("=" * 60)
     print("V2EX 备份工具")
     print("功能: 1) 备份我的收藏  2) 备份我的发帖  3) 备份我的回复")
@@ -680,21 +1340,36 @@ if __name__ == "__main__":
         print("\n请检查你的 Cookie 是否正确")
         exit(1)
     
+    # 节点归档模式
+    if args.node:
+        # 所有节点共享同一个限速器
+        limiter = RateLimiter(NODE_REQUEST_INTERVAL)
+        for node in args.node:
+            crawl_node(cookie, node, workers=args.workers,
+                       incremental=not args.full, limiter=limiter)
+        exit(0)
+    
+    # 刷新模式
+    if args.refresh:
+        for archive_file in args.refresh:
+            refresh_archive(cookie, archive_file, budget=args.budget)
+        exit(0)
+    
     # 获取用户名
     username = get_username_from_homepage(cookie)
     if not username:
         print("\n✗ 无法获取用户名，将只备份收藏")
     
     # 1. 备份收藏
-    favorites = backup_favorites(cookie)
+    favorites = backup_favorites(cookie, formats=formats)
     
     # 2. 备份发帖
     if username:
-        my_topics = backup_user_topics(cookie, username)
+        my_topics = backup_user_topics(cookie, username, formats=formats)
     
     # 3. 备份回复
     if username:
-        my_replies = backup_user_replies(cookie, username)
+        my_replies = backup_user_replies(cookie, username, formats=formats)
     
     print("\n" + "=" * 60)
     print("✅ 所有备份任务完成!")
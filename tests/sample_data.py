@@ -0,0 +1,45 @@
+from datetime import datetime
+
+# 导出测试用的主题记录，覆盖缺失字段、非 ASCII 字符和多个节点
+TOPICS = [
+    {
+        'title': '如何备份 V2EX 收藏',
+        'url': 'https://v2ex.com/t/1001',
+        'id': '1001',
+        'node': 'Python',
+        'node_url': 'https://v2ex.com/go/python',
+        'author': 'alice',
+        'author_url': 'https://v2ex.com/member/alice',
+        'replies': 12,
+        'votes': 3,
+        'created_time': '2026-09-01 10:00:00 +08:00',
+        'created_time_relative': '30 天前',
+        'last_reply_user': 'bob',
+    },
+    {
+        'title': '一个 "带引号" 的标题 & 符号 \\ 😀',
+        'url': 'https://v2ex.com/t/1002',
+        'id': '1002',
+        'node': '分享创造',
+        'author': 'bob',
+        'author_url': 'https://v2ex.com/member/bob',
+        'replies': 0,
+        'votes': 0,
+    },
+    {
+        'title': '没有节点的主题',
+        'url': 'https://v2ex.com/t/1003',
+        'id': '1003',
+        'replies': 1,
+        'votes': 0,
+        'created_time': '2026-09-02 11:00:00 +08:00',
+    },
+]
+
+
+class FrozenDatetime(datetime):
+    """固定 now()，让导出文件的时间戳和表头可重复"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 10, 1, 12, 0, 0)
@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+import main
+from sample_data import TOPICS, FrozenDatetime
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+EXPECTED = os.path.join(FIXTURES, 'export')
+
+# 期望输出由改造前的 save_topics / backup_user_replies 生成
+encoders = [pytest.param(False, id='stdlib')]
+if main.orjson:
+    encoders.append(pytest.param(True, id='orjson'))
+
+
+@pytest.fixture(params=encoders)
+def frozen(request, monkeypatch):
+    monkeypatch.setattr(main, 'datetime', FrozenDatetime)
+    if not request.param:
+        monkeypatch.setattr(main, 'orjson', None)
+
+
+def assert_same_bytes(files, prefix):
+    assert sorted(files) == ['json', 'md', 'txt']
+    for name, filename in files.items():
+        with open(filename, 'rb') as f, \
+                open(os.path.join(EXPECTED, f"{prefix}_20261001_120000.{name}"), 'rb') as expected:
+            assert f.read() == expected.read(), name
+
+
+def test_default_topic_export_matches_previous_release(tmp_path, frozen):
+    files = main.save_topics(TOPICS, 'favorites', str(tmp_path))
+    assert_same_bytes(files, 'favorites')
+
+
+def test_default_replies_export_matches_previous_release(tmp_path, frozen, monkeypatch):
+    with open(os.path.join(FIXTURES, 'replies.html'), encoding='utf-8') as f:
+        html = f.read()
+    monkeypatch.setattr(main, 'get_page', lambda cookie, url: html)
+
+    files = {}
+    real_export = main.export_records
+
+    def export_records(*args, **kwargs):
+        files.update(real_export(*args, **kwargs))
+        return files
+
+    monkeypatch.setattr(main, 'export_records', export_records)
+    main.backup_user_replies('', 'tester', str(tmp_path))
+    assert_same_bytes(files, 'my_replies_tester')
+
+
+def test_jsonl_does_not_depend_on_encoder(tmp_path, monkeypatch):
+    if not main.orjson:
+        pytest.skip("orjson 未安装")
+    fast = main.export_records(TOPICS, 'fast', formats=['jsonl'], output_dir=str(tmp_path))
+    monkeypatch.setattr(main, 'orjson', None)
+    stdlib = main.export_records(TOPICS, 'stdlib', formats=['jsonl'], output_dir=str(tmp_path))
+
+    with open(fast['jsonl'], 'rb') as a, open(stdlib['jsonl'], 'rb') as b:
+        assert a.read() == b.read()
+
+
+def test_plugin_format(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'EXPORT_FORMATS', dict(main.EXPORT_FORMATS))
+
+    @main.register_format('ids', 'ids.txt')
+    def render_ids(records, meta):
+        for record in records:
+            yield f"{meta['kind']}:{record['id']}\n"
+
+    files = main.export_records(TOPICS, 'plugin', formats=['ids', 'csv'], output_dir=str(tmp_path))
+
+    assert files['ids'].endswith('.ids.txt')
+    with open(files['ids'], encoding='utf-8') as f:
+        assert f.read() == "topics:1001\ntopics:1002\ntopics:1003\n"
+    with open(files['csv'], encoding='utf-8', newline='') as f:
+        assert f.readline().startswith('title,url,id,node,')
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        main.export_records(TOPICS, 'bad', formats=['xml'], output_dir=str(tmp_path))
+
+
+@pytest.mark.parametrize('obj', [
+    [],
+    [{}],
+    [{'s': 'x"\\\n\t😀', 'n': None, 't': True, 'f': False, 'i': 10 ** 30, 'x': 1.5,
+      'l': [1, {'a': []}], 'd': {}, 'e': [], 'nested': {'k': [1, 2]}}],
+    {'not': 'a list'},
+    [1, 'two'],
+])
+def test_stdlib_indented_json_matches_json_dumps(monkeypatch, obj):
+    monkeypatch.setattr(main, 'orjson', None)
+    expected = main.json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    assert main.dumps_json(obj, indent=True) == expected
+
+
+def test_saved_files_keep_column_alignment(capsys):
+    main.print_saved_files({'json': 'a.json', 'txt': 'a.txt', 'md': 'a.md'})
+    assert capsys.readouterr().out.splitlines()[2:] == [
+        "  📄 JSON: a.json",
+        "  📄 TXT:  a.txt",
+        "  📄 MD:   a.md",
+    ]
@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+
+import pytest
+
+import main
+
+
+class FakeNode:
+    """模拟 /go/{node} 列表，主题按 ids 的顺序排列"""
+
+    def __init__(self, ids, per_page=2):
+        self.ids = list(ids)
+        self.per_page = per_page
+        self.replies = {}
+        self.requested = []
+
+    def bump(self, topic_id):
+        """主题收到新回复，回到第 1 页"""
+        if topic_id in self.ids:
+            self.ids.remove(topic_id)
+        self.ids.insert(0, topic_id)
+        self.replies[topic_id] = self.replies.get(topic_id, 0) + 1
+
+    def total_pages(self):
+        return max((len(self.ids) + self.per_page - 1) // self.per_page, 1)
+
+    def render(self, page):
+        start = (page - 1) * self.per_page
+        items = ''.join(
+            f'<div class="cell from_x t_{i}"><span class="item_title">'
+            f'<a href="/t/{i}#reply1">主题 {i}</a></span>'
+            f'<strong><a href="/member/u">u</a></strong>'
+            f'<a class="count_livid">{self.replies.get(i, 0)}</a></div>'
+            for i in self.ids[start:start + self.per_page]
+        )
+        return (f'<div id="TopicsNode">{items}</div>'
+                f'<input class="page_input" max="{self.total_pages()}">')
+
+    def get_page(self, cookie, url):
+        page = int(url.split('p=')[1])
+        self.requested.append(page)
+        return self.render(page)
+
+
+def crawl(tmp_path, fake, monkeypatch, **kwargs):
+    monkeypatch.setattr(main, 'get_page', fake.get_page)
+    return main.crawl_node('', 'test', str(tmp_path), limiter=main.RateLimiter(0), **kwargs)
+
+
+def archived_ids(tmp_path):
+    with open(os.path.join(tmp_path, 'node_test.jsonl'), encoding='utf-8') as f:
+        return [json.loads(line)['id'] for line in f]
+
+
+def crawl_state(tmp_path):
+    with open(os.path.join(tmp_path, 'node_test.state.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_crawl_archives_each_topic_once(tmp_path, monkeypatch):
+    fake = FakeNode([1, 2, 3, 4, 4, 5, 6, 7])
+
+    assert crawl(tmp_path, fake, monkeypatch) == 7
+    assert archived_ids(tmp_path) == ['1', '2', '3', '4', '5', '6', '7']
+    assert crawl_state(tmp_path) == {'complete': True, 'next_page': None}
+
+
+def test_incremental_run_stops_at_archived_pages(tmp_path, monkeypatch):
+    fake = FakeNode(range(100, 0, -1))
+    crawl(tmp_path, fake, monkeypatch, workers=1)
+
+    fake.ids[:0] = [102, 101]
+    fake.requested = []
+    assert crawl(tmp_path, fake, monkeypatch, workers=1) == 2
+    assert sorted(archived_ids(tmp_path), key=int) == [str(i) for i in range(1, 103)]
+    assert max(fake.requested) < 10
+
+
+def test_interrupted_crawl_resumes_instead_of_stopping(tmp_path, monkeypatch):
+    fake = FakeNode(range(20, 0, -1))
+    get_page = fake.get_page
+
+    def interrupted(cookie, url):
+        if url.endswith('p=6'):
+            raise KeyboardInterrupt
+        return get_page(cookie, url)
+
+    monkeypatch.setattr(fake, 'get_page', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        crawl(tmp_path, fake, monkeypatch, workers=1)
+    assert crawl_state(tmp_path) == {'complete': False, 'next_page': 6}
+
+    monkeypatch.setattr(fake, 'get_page', get_page)
+    crawl(tmp_path, fake, monkeypatch, workers=1)
+    assert sorted(archived_ids(tmp_path), key=int) == [str(i) for i in range(1, 21)]
+    assert crawl_state(tmp_path)['complete'] is True
+
+
+def test_listing_shift_during_batch_is_refetched(tmp_path, monkeypatch):
+    fake = FakeNode(range(10))
+    page3_sent = threading.Event()
+    get_page = fake.get_page
+
+    def shifting(cookie, url):
+        # 第 3 页在移动前返回，第 2 页在主题 9 被顶到第 1 页之后返回：
+        # 原本在第 2 页末尾的主题 3 移到了已经抓过的第 3 页
+        if url.endswith('p=3') and not page3_sent.is_set():
+            html = get_page(cookie, url)
+            page3_sent.set()
+            return html
+        if url.endswith('p=2') and not page3_sent.is_set():
+            page3_sent.wait(5)
+            fake.ids.remove(9)
+            fake.ids.insert(0, 9)
+        return get_page(cookie, url)
+
+    monkeypatch.setattr(fake, 'get_page', shifting)
+    crawl(tmp_path, fake, monkeypatch, workers=2)
+
+    assert sorted(archived_ids(tmp_path), key=int) == [str(i) for i in range(10)]
+
+
+def test_new_topic_pushed_below_page_1_is_archived(tmp_path, monkeypatch):
+    fake = FakeNode(range(100, 0, -1), per_page=10)
+    crawl(tmp_path, fake, monkeypatch)
+
+    # 新主题 101 发布后，又有 10 个旧主题收到回复，把它挤到了第 2 页
+    fake.bump(101)
+    fake.replies[101] = 0
+    for topic_id in range(41, 51):
+        fake.bump(topic_id)
+
+    assert crawl(tmp_path, fake, monkeypatch) == 1
+    assert '101' in archived_ids(tmp_path)
+
+
+def test_reply_count_changes_are_recorded(tmp_path, monkeypatch):
+    fake = FakeNode(range(100, 0, -1), per_page=10)
+    crawl(tmp_path, fake, monkeypatch, workers=1)
+    fake.bump(7)
+
+    crawl(tmp_path, fake, monkeypatch, workers=1)
+    assert main.load_seen_ids(os.path.join(tmp_path, 'node_test.jsonl'))['7'] == 1
+    topics = main.load_archive(os.path.join(tmp_path, 'node_test.jsonl'))
+    assert len(topics) == 100
+    assert [t['replies'] for t in topics if t['id'] == '7'] == [1]
+
+    # 回复数已经更新，下一次增量运行在第 1 页就停止
+    fake.requested = []
+    crawl(tmp_path, fake, monkeypatch, workers=1)
+    assert max(fake.requested) == 1
+
+
+def test_reordering_within_page_1_does_not_refetch(tmp_path, monkeypatch):
+    fake = FakeNode(range(40, 0, -1))
+    get_page = fake.get_page
+
+    def busy(cookie, url):
+        # 每次抓取第 1 页时，第 1 页上的主题都收到了新回复
+        if url.endswith('p=1'):
+            fake.bump(fake.ids[1])
+        return get_page(cookie, url)
+
+    monkeypatch.setattr(fake, 'get_page', busy)
+    crawl(tmp_path, fake, monkeypatch, workers=4)
+
+    batches = 3
+    assert len(fake.requested) <= 20 + batches + 2
+    assert set(archived_ids(tmp_path)) == {str(i) for i in range(1, 41)}
+
+
+def test_continuous_shift_is_bounded_and_warned(tmp_path, monkeypatch, capsys):
+    fake = FakeNode(range(40, 0, -1))
+    get_page = fake.get_page
+    next_id = iter(range(1000, 2000))
+
+    def busy(cookie, url):
+        # 每次抓取第 1 页之前都有新主题发布
+        if url.endswith('p=1'):
+            fake.bump(next(next_id))
+        return get_page(cookie, url)
+
+    monkeypatch.setattr(fake, 'get_page', busy)
+    crawl(tmp_path, fake, monkeypatch, workers=4)
+
+    # 每批最多重抓一轮：请求数最多约为页数的 2 倍
+    assert len(fake.requested) <= 2 * fake.total_pages() + 10
+    assert '可能被漏掉' in capsys.readouterr().out
+    assert {str(i) for i in range(1, 41)} <= set(archived_ids(tmp_path))
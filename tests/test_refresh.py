@@ -0,0 +1,134 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import main
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def make_archive(tmp_path, age_days=30, count=5):
+    created = datetime.now() - timedelta(days=age_days + 10)
+    stamp = (datetime.now() - timedelta(days=age_days)).strftime("%Y%m%d_%H%M%S")
+    topics = [
+        {
+            'id': str(i),
+            'title': f"主题 {i}",
+            'replies': 10 * (count - i),
+            'votes': 1,
+            'last_reply_user': 'old',
+            'created_time': created.strftime(main.TIME_FORMAT) + " +08:00",
+        }
+        for i in range(count)
+    ]
+    archive_file = str(tmp_path / f"favorites_{stamp}.json")
+    with open(archive_file, 'w', encoding='utf-8') as f:
+        json.dump(topics, f, ensure_ascii=False)
+    return archive_file
+
+
+def refresh(archive_file, monkeypatch, response, budget=2):
+    requested = []
+
+    def fetch_page(cookie, url):
+        topic_id = url.rsplit('/', 1)[-1]
+        requested.append(topic_id)
+        return response(topic_id) if callable(response) else response
+
+    monkeypatch.setattr(main, 'fetch_page', fetch_page)
+    main.refresh_archive('', archive_file, budget=budget, limiter=main.RateLimiter(0))
+    with open(archive_file, encoding='utf-8') as f:
+        return json.load(f), requested
+
+
+def test_parse_topic_page():
+    assert main.parse_topic_page(fixture('topic.html')) == {
+        'replies': 2, 'votes': 12, 'last_reply_user': 'bob',
+    }
+    assert main.parse_topic_page(fixture('restricted.html')) is None
+
+
+def test_refresh_updates_fields(tmp_path, monkeypatch):
+    archive_file = make_archive(tmp_path)
+    topics, requested = refresh(archive_file, monkeypatch, (200, fixture('topic.html')))
+
+    assert requested == ['0', '1']
+    assert topics[0]['replies'] == 2
+    assert topics[0]['votes'] == 12
+    assert topics[0]['last_reply_user'] == 'bob'
+    assert 'changed_at' in topics[0]
+
+
+def test_refresh_ignores_non_topic_pages(tmp_path, monkeypatch):
+    archive_file = make_archive(tmp_path)
+    with open(archive_file, encoding='utf-8') as f:
+        original = json.load(f)
+
+    topics, _ = refresh(archive_file, monkeypatch, (200, fixture('restricted.html')))
+
+    for before, after in zip(original, topics):
+        assert after['replies'] == before['replies']
+        assert after['votes'] == before['votes']
+        assert 'changed_at' not in after
+    assert [t.get('unavailable') for t in topics] == [1, 1, None, None, None]
+
+
+def test_unavailable_topics_do_not_starve_the_budget(tmp_path, monkeypatch):
+    archive_file = make_archive(tmp_path)
+
+    def response(topic_id):
+        if topic_id in ('0', '1'):
+            return 200, fixture('restricted.html')
+        return 200, fixture('topic.html')
+
+    requested = []
+    for _ in range(3):
+        topics, run = refresh(archive_file, monkeypatch, response)
+        requested.append(run)
+
+    assert requested[0] == ['0', '1']
+    assert set(requested[1] + requested[2]) >= {'2', '3', '4'}
+    assert [t['replies'] for t in topics[:2]] == [50, 40]
+    assert all(t['replies'] == 2 for t in topics[2:])
+
+
+def test_refresh_skips_truncated_jsonl_line(tmp_path, monkeypatch):
+    archive_file = str(tmp_path / 'node_test.jsonl')
+    with open(archive_file, 'w', encoding='utf-8') as f:
+        f.write('{"id": "1", "title": "主题 1", "replies": 5}\n')
+        f.write('{"id": "2", "title": "主')
+
+    topics, requested = refresh(archive_file, monkeypatch, (200, fixture('topic.html')))
+
+    assert requested == ['1']
+    with open(archive_file, encoding='utf-8') as f:
+        assert [json.loads(line)['replies'] for line in f] == [2]
+
+
+def test_only_confirmed_404_counts_as_checked(tmp_path, monkeypatch):
+    archive_file = make_archive(tmp_path)
+    baseline = main.archive_time(archive_file).strftime(main.TIME_FORMAT)
+
+    topics, _ = refresh(archive_file, monkeypatch, (None, None))
+    assert all(t['checked_at'] == baseline for t in topics)
+
+    topics, _ = refresh(archive_file, monkeypatch, (404, 'not found'))
+    assert topics[0]['checked_at'] != baseline
+    assert topics[0]['replies'] == 50
+
+
+def test_unvisited_topics_keep_their_staleness(tmp_path, monkeypatch):
+    archive_file = make_archive(tmp_path)
+    baseline = main.archive_time(archive_file).strftime(main.TIME_FORMAT)
+
+    topics, _ = refresh(archive_file, monkeypatch, (200, fixture('topic.html')))
+    assert [t['checked_at'] == baseline for t in topics] == [False, False, True, True, True]
+
+    # 下一次刷新应该先处理上次没有轮到的主题，而不是刚检查过的
+    _, requested = refresh(archive_file, monkeypatch, (200, fixture('topic.html')), budget=1)
+    assert requested == ['2']